@@ -1,21 +1,34 @@
 """Download and analyze IMDb datasets for exploratory insights.
 
-This script performs a streaming download of selected IMDb datasets, loads the
-content with pandas using chunked processing to keep memory usage manageable,
-and produces summary tables and figures describing trends in the catalog of
-rated feature films. Generated artefacts are written into the ``reports``
-directory.
+This script performs a streaming download of selected IMDb datasets, splits the
+title table into line-aligned byte ranges that are parsed and aggregated in
+parallel worker processes to keep memory usage manageable, and produces summary
+tables and figures describing trends in the catalog of rated feature films.
+Generated artefacts are written into the ``reports`` directory.
 """
 from __future__ import annotations
 
-from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+import gzip
+import heapq
+import itertools
 import math
+from multiprocessing import shared_memory
+import os
 from pathlib import Path
-from typing import Dict
+import shutil
+from typing import Dict, Iterable
 
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
 import requests
+from requests.adapters import HTTPAdapter
 import seaborn as sns
 
 DATA_URLS: Dict[str, str] = {
@@ -28,6 +41,99 @@ REPORT_DIR = Path("reports")
 FIGURE_DIR = REPORT_DIR / "figures"
 SUMMARY_DIR = REPORT_DIR / "summaries"
 
+DOWNLOAD_STREAMS = 4
+DOWNLOAD_CHUNK_SIZE = 1_048_576  # 1 MB
+BASICS_RANGE_BYTES = 64 << 20  # 64 MB of decompressed TSV per worker task
+# Rated feature films joined with their ratings, one Parquet file per slice.
+JOINED_CACHE_DIR = DATA_DIR / "joined_movies"
+
+# The genre vocabulary published by IMDb. Anything outside it is tallied as
+# "Other" so that per-genre accumulators can be fixed-size arrays.
+GENRE_NAMES = (
+    "Action",
+    "Adult",
+    "Adventure",
+    "Animation",
+    "Biography",
+    "Comedy",
+    "Crime",
+    "Documentary",
+    "Drama",
+    "Family",
+    "Fantasy",
+    "Film-Noir",
+    "Game-Show",
+    "History",
+    "Horror",
+    "Music",
+    "Musical",
+    "Mystery",
+    "News",
+    "Reality-TV",
+    "Romance",
+    "Sci-Fi",
+    "Short",
+    "Sport",
+    "Talk-Show",
+    "Thriller",
+    "War",
+    "Western",
+    "Other",
+)
+GENRE_VALUE_SET = pa.array(GENRE_NAMES)
+OTHER_GENRE_CODE = GENRE_NAMES.index("Other")
+
+# Release years are accumulated in dense arrays indexed by offset from the
+# earliest year present in title.basics.
+FIRST_YEAR = 1874
+YEAR_SLOTS = 256
+
+TOP_TITLE_COUNT = 20
+TOP_TITLE_COLUMNS = ["tconst", "primaryTitle", "startYear", "averageRating", "numVotes"]
+# Far more points than the rating-vs-votes figure can resolve; in practice the
+# number of films above the popularity threshold is well below this cap.
+SCATTER_SAMPLE_SIZE = 200_000
+
+# The IMDb dumps are tab-separated and never quoted; titles may contain stray
+# quote characters that must be read literally.
+TSV_PARSE_OPTIONS = pv.ParseOptions(delimiter="\t", quote_char=False)
+
+# Every column is declared up front so that Arrow does not infer types from the
+# first block (``endYear`` is entirely null there, for instance). Numeric
+# columns use the narrowest type that safely holds them: years fit in int16,
+# while runtimes (parsed for every title type) have outliers close to the
+# uint16 limit and stay int32.
+BASICS_SCHEMA = pa.schema(
+    [
+        ("tconst", pa.string()),
+        ("titleType", pa.string()),
+        ("primaryTitle", pa.string()),
+        ("originalTitle", pa.string()),
+        ("isAdult", pa.string()),
+        ("startYear", pa.int16()),
+        ("endYear", pa.string()),
+        ("runtimeMinutes", pa.int32()),
+        ("genres", pa.string()),
+    ]
+)
+BASICS_CONVERT_OPTIONS = pv.ConvertOptions(
+    column_types={column.name: column.type for column in BASICS_SCHEMA},
+    include_columns=[
+        "tconst",
+        "titleType",
+        "primaryTitle",
+        "startYear",
+        "runtimeMinutes",
+        "genres",
+    ],
+    null_values=["\\N"],
+    strings_can_be_null=True,
+)
+
+# Rating lookup tables attached from shared memory in each worker process.
+_WORKER_LOOKUPS: Dict[str, np.ndarray] = {}
+_WORKER_SHARED_BLOCKS: list[shared_memory.SharedMemory] = []
+
 
 def ensure_directories() -> None:
     """Create folders that store input data and generated artefacts."""
@@ -35,8 +141,43 @@ def ensure_directories() -> None:
         path.mkdir(parents=True, exist_ok=True)
 
 
+def download_range(
+    session: requests.Session, url: str, dest: Path, start: int, end: int
+) -> None:
+    """Fetch the inclusive byte range ``start``-``end`` of ``url`` into ``dest``."""
+    response = session.get(
+        url, headers={"Range": f"bytes={start}-{end}"}, stream=True, timeout=60
+    )
+    response.raise_for_status()
+    if response.status_code != 206:
+        raise RuntimeError(f"Server ignored range request for {url}")
+    written = 0
+    with dest.open("r+b") as fh:
+        fh.seek(start)
+        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            if chunk:
+                written += fh.write(chunk)
+    # Some servers cap the size of a range response; a short slice would leave
+    # zero-filled bytes in the archive, so refuse it before it is renamed in.
+    if written != end - start + 1:
+        raise RuntimeError(
+            f"Received {written} of {end - start + 1} bytes for range "
+            f"{start}-{end} of {url}"
+        )
+
+
 def download_datasets() -> None:
-    """Download the required IMDb datasets if they are not already present."""
+    """Download the required IMDb datasets if they are not already present.
+
+    When the server advertises byte-range support the file is fetched over
+    ``DOWNLOAD_STREAMS`` parallel connections, each writing its slice at the
+    matching offset; otherwise it falls back to a single streamed request.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=DOWNLOAD_STREAMS, pool_maxsize=DOWNLOAD_STREAMS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
     for filename, url in DATA_URLS.items():
         dest = DATA_DIR / filename
         if dest.exists():
@@ -44,132 +185,462 @@ def download_datasets() -> None:
             continue
 
         print(f"⬇️  Downloading {filename}...")
-        response = requests.get(url, stream=True, timeout=60)
-        response.raise_for_status()
-        with dest.open("wb") as fh:
-            for chunk in response.iter_content(chunk_size=1_048_576):  # 1 MB
-                if chunk:
-                    fh.write(chunk)
+        partial = dest.with_name(f"{filename}.part")
+        head = session.head(url, allow_redirects=True, timeout=60)
+        head.raise_for_status()
+        size = int(head.headers.get("Content-Length", 0))
+        if head.headers.get("Accept-Ranges") == "bytes" and size > 0:
+            with partial.open("wb") as fh:
+                fh.truncate(size)
+            part_size = -(-size // DOWNLOAD_STREAMS)
+            with ThreadPoolExecutor(max_workers=DOWNLOAD_STREAMS) as pool:
+                futures = [
+                    pool.submit(
+                        download_range,
+                        session,
+                        head.url,
+                        partial,
+                        start,
+                        min(start + part_size, size) - 1,
+                    )
+                    for start in range(0, size, part_size)
+                ]
+                for future in futures:
+                    future.result()
+        else:
+            response = session.get(url, stream=True, timeout=60)
+            response.raise_for_status()
+            with partial.open("wb") as fh:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    if chunk:
+                        fh.write(chunk)
+        partial.replace(dest)
         print(f"✅ Finished downloading {filename} ({dest.stat().st_size / 1_048_576:.1f} MB).")
 
 
-def weighted_average(ratings: pd.Series, weights: pd.Series) -> float:
+def weighted_reduce(
+    keys: np.ndarray, ratings: np.ndarray, votes: np.ndarray, size: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return vote-weighted rating sums and vote totals per integer key."""
+    weighted_sums = np.bincount(keys, weights=ratings * votes, minlength=size)
+    vote_totals = np.bincount(keys, weights=votes, minlength=size)
+    return weighted_sums, vote_totals
+
+
+def add_counts(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Add two bincount-style arrays, padding the shorter one with zeros."""
+    if left.size < right.size:
+        left, right = right, left
+    total = left.copy()
+    total[: right.size] += right
+    return total
+
+
+def quantiles_from_counts(counts: np.ndarray, quantiles: list[float]) -> pd.Series:
+    """Quantiles of the values ``0..len(counts) - 1`` weighted by ``counts``.
+
+    Matches ``pd.Series.quantile`` with linear interpolation over the
+    expanded values without materialising them.
+    """
+    total = int(counts.sum())
+    if total == 0:
+        return pd.Series(float("nan"), index=quantiles)
+    cumulative = np.cumsum(counts)
+    positions = np.asarray(quantiles) * (total - 1)
+    lower = np.searchsorted(cumulative, np.floor(positions), side="right")
+    upper = np.searchsorted(cumulative, np.ceil(positions), side="right")
+    values = lower + (upper - lower) * (positions - np.floor(positions))
+    return pd.Series(values, index=quantiles)
+
+
+def weighted_average(ratings: np.ndarray, weights: np.ndarray) -> float:
+    # Only weighted slots contribute, so skip the empty ones of a dense lookup
+    # and accumulate in float64 (float32 ratings rounded to their one decimal).
+    mask = weights > 0
+    weights = weights[mask].astype(np.float64)
     total_weight = weights.sum()
     if total_weight == 0:
         return float("nan")
-    return float((ratings * weights).sum() / total_weight)
+    ratings = np.round(ratings[mask].astype(np.float64), 1)
+    return float(np.dot(ratings, weights) / total_weight)
+
+
+def load_rating_lookup(ratings_path: Path) -> tuple[np.ndarray, np.ndarray]:
+    """Stream ``title.ratings`` into dense rating and vote arrays.
+
+    Both arrays are indexed by the numeric part of ``tconst``, so joining a
+    title to its rating is a direct gather rather than a hash lookup. Slot 0
+    (tt0000000) is never a real title, which lets callers redirect
+    out-of-range identifiers there. Unrated slots hold a zero rating and zero
+    votes, so the tables can feed a dot product directly; every rated title
+    has at least one vote.
+    """
+    rating_lookup = np.zeros(1, dtype=np.float32)
+    votes_lookup = np.zeros(1, dtype=np.int32)
+    reader = pv.open_csv(
+        ratings_path,
+        read_options=pv.ReadOptions(block_size=16 << 20),
+        parse_options=TSV_PARSE_OPTIONS,
+        convert_options=pv.ConvertOptions(
+            column_types={
+                "tconst": pa.string(),
+                "averageRating": pa.float32(),
+                "numVotes": pa.int32(),
+            },
+        ),
+    )
+    for batch in reader:
+        if batch.num_rows == 0:
+            continue
+        ids = pc.cast(pc.utf8_slice_codeunits(batch.column("tconst"), 2), pa.int64()).to_numpy()
+        required = int(ids.max()) + 1
+        if required > rating_lookup.size:
+            grow = max(required, 2 * rating_lookup.size) - rating_lookup.size
+            rating_lookup = np.concatenate([rating_lookup, np.zeros(grow, dtype=np.float32)])
+            votes_lookup = np.concatenate([votes_lookup, np.zeros(grow, dtype=np.int32)])
+        rating_lookup[ids] = batch.column("averageRating").to_numpy()
+        votes_lookup[ids] = batch.column("numVotes").to_numpy()
+    return rating_lookup, votes_lookup
+
+
+def decompress_basics(basics_path: Path) -> Path:
+    """Decompress ``title.basics`` once so that workers can seek into it.
+
+    gzip streams cannot be split, so parallel parsing needs the plain TSV. The
+    decompressed copy is reused until the archive is newer than it.
+    """
+    tsv_path = basics_path.with_suffix("")
+    if tsv_path.exists() and tsv_path.stat().st_mtime >= basics_path.stat().st_mtime:
+        return tsv_path
+    print(f"🗜️  Decompressing {basics_path.name}...")
+    partial = tsv_path.with_name(f"{tsv_path.name}.part")
+    with gzip.open(basics_path, "rb") as src, partial.open("wb") as dst:
+        shutil.copyfileobj(src, dst, length=16 << 20)
+    partial.replace(tsv_path)
+    return tsv_path
+
+
+def split_line_ranges(path: Path, target_bytes: int) -> list[tuple[int, int]]:
+    """Split ``path`` past its header into line-aligned ``(start, end)`` byte ranges."""
+    size = path.stat().st_size
+    ranges = []
+    with path.open("rb") as fh:
+        start = len(fh.readline())
+        while start < size:
+            fh.seek(min(start + target_bytes, size))
+            fh.readline()
+            end = fh.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def share_array(array: np.ndarray) -> tuple[shared_memory.SharedMemory, tuple[str, int, str]]:
+    """Copy ``array`` into a new shared memory block and describe how to attach it."""
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+    return block, (block.name, array.size, array.dtype.str)
+
+
+def attach_rating_lookup(
+    rating_spec: tuple[str, int, str], votes_spec: tuple[str, int, str]
+) -> None:
+    """Worker initializer mapping the shared rating lookup tables into this process."""
+    for key, (name, size, dtype) in (("rating", rating_spec), ("votes", votes_spec)):
+        block = shared_memory.SharedMemory(name=name)
+        _WORKER_SHARED_BLOCKS.append(block)
+        _WORKER_LOOKUPS[key] = np.ndarray((size,), dtype=dtype, buffer=block.buf)
+
+
+@dataclass
+class PartialAggregates:
+    """Aggregates for a slice of feature films that merge commutatively."""
+
+    movies: int = 0
+    year_counts: np.ndarray = field(default_factory=lambda: np.zeros(YEAR_SLOTS, dtype=np.int64))
+    year_weighted_sums: np.ndarray = field(default_factory=lambda: np.zeros(YEAR_SLOTS))
+    year_votes: np.ndarray = field(default_factory=lambda: np.zeros(YEAR_SLOTS))
+    genre_weighted_sums: np.ndarray = field(default_factory=lambda: np.zeros(len(GENRE_NAMES)))
+    genre_votes: np.ndarray = field(default_factory=lambda: np.zeros(len(GENRE_NAMES)))
+    genre_counts: np.ndarray = field(
+        default_factory=lambda: np.zeros(len(GENRE_NAMES), dtype=np.int64)
+    )
+    runtime_counts: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    top_titles: list[tuple[int, str, dict]] = field(default_factory=list)
+    scatter_sample: pd.DataFrame | None = None
+
+    def add_movies(self, movies: pa.Table, rng: np.random.Generator) -> None:
+        """Fold a table of rated feature films into the aggregates.
+
+        The table is reduced with Arrow compute kernels and NumPy directly;
+        only the handful of popular titles kept for the scatter sample are
+        converted to pandas.
+        """
+        # The lookup stores ratings as float32; widen them once per slice and
+        # round back to their single published decimal so that sums, means
+        # and reported values match a float64 parse of the source.
+        movies = movies.set_column(
+            movies.schema.get_field_index("averageRating"),
+            "averageRating",
+            pc.round(pc.cast(movies["averageRating"], pa.float64()), 1),
+        )
+        ratings = movies["averageRating"].to_numpy()
+        votes = movies["numVotes"].to_numpy()
+
+        # Missing years become 0, which falls outside the year slots, so one
+        # mask covers both unknown and out-of-range years.
+        years = pc.fill_null(movies["startYear"], 0).to_numpy()
+        year_offsets = years.astype(np.int64) - FIRST_YEAR
+        in_range = (year_offsets >= 0) & (year_offsets < YEAR_SLOTS)
+        year_offsets = year_offsets[in_range]
+        self.year_counts += np.bincount(year_offsets, minlength=YEAR_SLOTS)
+        weighted_sums, vote_totals = weighted_reduce(
+            year_offsets,
+            ratings[in_range],
+            votes[in_range].astype(np.float64),
+            YEAR_SLOTS,
+        )
+        self.year_weighted_sums += weighted_sums
+        self.year_votes += vote_totals
 
+        runtimes = pc.drop_null(movies["runtimeMinutes"]).to_numpy()
+        self.runtime_counts = add_counts(
+            self.runtime_counts, np.bincount(runtimes[runtimes >= 0])
+        )
 
-def analyse() -> None:
-    ensure_directories()
-    download_datasets()
+        top_indices = pc.select_k_unstable(
+            movies, TOP_TITLE_COUNT, sort_keys=[("numVotes", "descending")]
+        )
+        self.merge_top_titles(
+            (row["numVotes"], row["tconst"], row)
+            for row in movies.take(top_indices).select(TOP_TITLE_COLUMNS).to_pylist()
+        )
 
-    ratings_path = DATA_DIR / "title.ratings.tsv.gz"
-    basics_path = DATA_DIR / "title.basics.tsv.gz"
+        # Bottom-k sampling on a uniform random key keeps a uniform sample of
+        # the popular titles across chunks without holding all of them.
+        popular_subset = movies.filter(pc.field("numVotes") >= 50_000)
+        if popular_subset.num_rows:
+            self.merge_scatter_sample(
+                pd.DataFrame(
+                    {
+                        "averageRating": popular_subset["averageRating"].to_numpy(),
+                        "numVotes": popular_subset["numVotes"].to_numpy(),
+                        "sample_key": rng.random(popular_subset.num_rows),
+                    },
+                    copy=False,
+                )
+            )
 
-    print("📥 Loading ratings table into memory...")
-    ratings_df = pd.read_csv(
-        ratings_path,
-        sep="\t",
-        na_values="\\N",
-        dtype={"tconst": "string", "averageRating": "float64", "numVotes": "int32"},
-        compression="gzip",
-    ).set_index("tconst")
-
-    print("⚙️  Preparing aggregators...")
-    movies_per_year = Counter()
-    year_weighted_sums = defaultdict(lambda: {"weighted_sum": 0.0, "votes": 0})
-    genre_stats = defaultdict(lambda: {"weighted_sum": 0.0, "votes": 0, "count": 0})
-    runtime_minutes: list[float] = []
-    top_titles_frames: list[pd.DataFrame] = []
-    scatter_frames: list[pd.DataFrame] = []
-
-    chunk_iter = pd.read_csv(
-        basics_path,
-        sep="\t",
-        na_values="\\N",
-        dtype={
-            "tconst": "string",
-            "titleType": "string",
-            "primaryTitle": "string",
-            "startYear": "string",
-            "runtimeMinutes": "string",
-            "genres": "string",
-        },
-        compression="gzip",
-        chunksize=500_000,
+        genre_lists = pc.split_pattern(movies["genres"], ",")
+        parents = pc.list_parent_indices(genre_lists).to_numpy()
+        codes = (
+            pc.index_in(pc.list_flatten(genre_lists), value_set=GENRE_VALUE_SET)
+            .fill_null(OTHER_GENRE_CODE)
+            .to_numpy()
+        )
+        weighted_sums, vote_totals = weighted_reduce(
+            codes,
+            ratings[parents],
+            votes[parents].astype(np.float64),
+            len(GENRE_NAMES),
+        )
+        self.genre_weighted_sums += weighted_sums
+        self.genre_votes += vote_totals
+        self.genre_counts += np.bincount(codes, minlength=len(GENRE_NAMES))
+
+        self.movies += movies.num_rows
+
+    def merge_top_titles(self, entries: Iterable[tuple[int, str, dict]]) -> None:
+        """Keep the ``TOP_TITLE_COUNT`` most-voted entries, most-voted first."""
+        self.top_titles = heapq.nlargest(
+            TOP_TITLE_COUNT,
+            itertools.chain(self.top_titles, entries),
+            key=lambda entry: entry[:2],
+        )
+
+    def merge_scatter_sample(self, sample: pd.DataFrame) -> None:
+        if self.scatter_sample is not None:
+            sample = pd.concat([self.scatter_sample, sample])
+        self.scatter_sample = sample.nsmallest(SCATTER_SAMPLE_SIZE, "sample_key")
+
+    def merge(self, other: PartialAggregates) -> None:
+        """Fold another worker's aggregates into this one."""
+        self.movies += other.movies
+        self.year_counts += other.year_counts
+        self.year_weighted_sums += other.year_weighted_sums
+        self.year_votes += other.year_votes
+        self.genre_weighted_sums += other.genre_weighted_sums
+        self.genre_votes += other.genre_votes
+        self.genre_counts += other.genre_counts
+        self.runtime_counts = add_counts(self.runtime_counts, other.runtime_counts)
+        self.merge_top_titles(other.top_titles)
+        if other.scatter_sample is not None:
+            self.merge_scatter_sample(other.scatter_sample)
+
+
+def process_range(
+    tsv_path: Path, start: int, end: int, seed: int, cache_dir: Path
+) -> PartialAggregates:
+    """Parse one byte range of ``title.basics`` and aggregate its rated feature films.
+
+    The joined films are also written to ``cache_dir`` as a Parquet part named
+    after ``seed`` so that later runs can skip parsing the TSV.
+    """
+    with tsv_path.open("rb") as fh:
+        fh.seek(start)
+        data = fh.read(end - start)
+    table = pv.read_csv(
+        pa.BufferReader(data),
+        read_options=pv.ReadOptions(column_names=BASICS_SCHEMA.names, use_threads=False),
+        parse_options=TSV_PARSE_OPTIONS,
+        convert_options=BASICS_CONVERT_OPTIONS,
+    )
+    movie_table = table.filter(pc.field("titleType") == "movie").drop_columns(["titleType"])
+
+    aggregates = PartialAggregates()
+    if movie_table.num_rows == 0:
+        return aggregates
+
+    rating_lookup = _WORKER_LOOKUPS["rating"]
+    votes_lookup = _WORKER_LOOKUPS["votes"]
+    title_ids = pc.cast(
+        pc.utf8_slice_codeunits(movie_table["tconst"], 2), pa.int64()
+    ).to_numpy()
+    title_ids = np.where(title_ids < rating_lookup.size, title_ids, 0)
+    votes = votes_lookup[title_ids]
+    rated = votes > 0
+    movies = (
+        movie_table.filter(pa.array(rated))
+        .append_column("averageRating", pa.array(rating_lookup[title_ids[rated]]))
+        .append_column("numVotes", pa.array(votes[rated]))
     )
+    # The newest titles at the tail of the file are often all unrated, and the
+    # Arrow top-k kernel rejects an empty table.
+    if movies.num_rows == 0:
+        return aggregates
+
+    pq.write_table(
+        movies,
+        cache_dir / f"part-{seed:05d}.parquet",
+        compression="zstd",
+        use_dictionary=["genres"],
+        row_group_size=1_000_000,
+    )
+    aggregates.add_movies(movies, np.random.default_rng(seed))
+    return aggregates
 
-    processed_rows = 0
-    next_milestone = 2_000_000
-    for chunk in chunk_iter:
-        processed_rows += len(chunk)
-        movies = chunk[chunk["titleType"] == "movie"].copy()
-        movies = movies.join(ratings_df, how="inner", on="tconst")
 
-        movies["startYear"] = pd.to_numeric(movies["startYear"], errors="coerce")
-        movies["runtimeMinutes"] = pd.to_numeric(movies["runtimeMinutes"], errors="coerce")
+def process_cached_part(part_path: Path) -> PartialAggregates:
+    """Aggregate one cached Parquet part written by :func:`process_range`."""
+    seed = int(part_path.stem.split("-")[1])
+    aggregates = PartialAggregates()
+    aggregates.add_movies(pq.read_table(part_path), np.random.default_rng(seed))
+    return aggregates
 
-        year_counts = movies["startYear"].dropna().astype(int).value_counts()
-        movies_per_year.update(year_counts.to_dict())
 
-        valid_years = movies.dropna(subset=["startYear", "numVotes"]).copy()
-        valid_years["startYear"] = valid_years["startYear"].astype(int)
-        grouped_years = valid_years.groupby("startYear")
-        for year, group in grouped_years:
-            votes = group["numVotes"].astype(float)
-            year_weighted_sums[year]["weighted_sum"] += float((group["averageRating"] * votes).sum())
-            year_weighted_sums[year]["votes"] += int(votes.sum())
+def joined_cache_is_fresh(cache_dir: Path, sources: list[Path]) -> bool:
+    """Whether ``cache_dir`` exists and was written after every source file."""
+    if not cache_dir.is_dir():
+        return False
+    newest_source = max(source.stat().st_mtime for source in sources)
+    return cache_dir.stat().st_mtime >= newest_source
 
-        runtime_minutes.extend(movies["runtimeMinutes"].dropna().tolist())
 
-        top_titles_frames.append(
-            movies[["tconst", "primaryTitle", "startYear", "averageRating", "numVotes"]]
-        )
+def collect_partials(pool: ProcessPoolExecutor, tasks: list[tuple]) -> PartialAggregates:
+    """Submit ``(function, *args)`` tasks to ``pool`` and merge their aggregates.
 
-        popular_subset = movies[movies["numVotes"] >= 50_000][["averageRating", "numVotes"]]
-        if not popular_subset.empty:
-            scatter_frames.append(popular_subset)
+    Results are merged in submission order so the floating-point sums, and
+    therefore the written reports, are identical from run to run.
+    """
+    totals = PartialAggregates()
+    futures = [pool.submit(*task) for task in tasks]
+    next_milestone = 100_000
+    for future in futures:
+        totals.merge(future.result())
+        if totals.movies >= next_milestone:
+            print(f"   ...aggregated {totals.movies:,} rated feature films")
+            next_milestone = (totals.movies // 100_000 + 1) * 100_000
+    return totals
 
-        genre_chunk = movies.dropna(subset=["genres"]).copy()
-        if not genre_chunk.empty:
-            exploded = genre_chunk.assign(genre=genre_chunk["genres"].str.split(",")).explode("genre")
-            exploded = exploded[exploded["genre"].notna() & (exploded["genre"] != "\\N")]
-            for genre, group in exploded.groupby("genre"):
-                votes = group["numVotes"].astype(float)
-                genre_stats[genre]["weighted_sum"] += float((group["averageRating"] * votes).sum())
-                genre_stats[genre]["votes"] += int(votes.sum())
-                genre_stats[genre]["count"] += len(group)
 
-        if processed_rows >= next_milestone:
-            print(f"   ...processed {processed_rows:,} title basics rows")
-            next_milestone += 2_000_000
+def analyse() -> None:
+    ensure_directories()
+    download_datasets()
 
-    print(f"✅ Finished processing {processed_rows:,} rows from title.basics.tsv.gz")
+    ratings_path = DATA_DIR / "title.ratings.tsv.gz"
+    basics_path = DATA_DIR / "title.basics.tsv.gz"
 
-    movies_per_year_df = (
-        pd.DataFrame(sorted(movies_per_year.items()), columns=["year", "count"])
-        .sort_values("year")
-        .reset_index(drop=True)
+    print("📥 Streaming ratings into lookup tables...")
+    rating_lookup, votes_lookup = load_rating_lookup(ratings_path)
+
+    if joined_cache_is_fresh(JOINED_CACHE_DIR, [basics_path, ratings_path]):
+        parts = sorted(JOINED_CACHE_DIR.glob("part-*.parquet"))
+        print(f"📦 Aggregating {len(parts)} cached Parquet parts in parallel...")
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+            totals = collect_partials(pool, [(process_cached_part, part) for part in parts])
+    else:
+        tsv_path = decompress_basics(basics_path)
+        byte_ranges = split_line_ranges(tsv_path, BASICS_RANGE_BYTES)
+        staging_dir = JOINED_CACHE_DIR.with_name(f"{JOINED_CACHE_DIR.name}.partial")
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        staging_dir.mkdir(parents=True)
+
+        print(f"⚙️  Aggregating {len(byte_ranges)} slices of title.basics in parallel...")
+        rating_block, rating_spec = share_array(rating_lookup)
+        votes_block, votes_spec = share_array(votes_lookup)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=os.cpu_count(),
+                initializer=attach_rating_lookup,
+                initargs=(rating_spec, votes_spec),
+            ) as pool:
+                totals = collect_partials(
+                    pool,
+                    [
+                        (process_range, tsv_path, range_start, range_end, seed, staging_dir)
+                        for seed, (range_start, range_end) in enumerate(byte_ranges)
+                    ],
+                )
+        finally:
+            for block in (rating_block, votes_block):
+                block.close()
+                block.unlink()
+
+        shutil.rmtree(JOINED_CACHE_DIR, ignore_errors=True)
+        staging_dir.replace(JOINED_CACHE_DIR)
+
+    print(f"✅ Finished aggregating {totals.movies:,} rated feature films from title.basics")
+
+    years = FIRST_YEAR + np.arange(YEAR_SLOTS)
+    observed_years = totals.year_counts > 0
+    movies_per_year_df = pd.DataFrame(
+        {"year": years[observed_years], "count": totals.year_counts[observed_years]}
     )
     movies_per_year_df = movies_per_year_df[movies_per_year_df["year"] >= 1900]
 
-    yearly_rating_records = []
-    for year, payload in year_weighted_sums.items():
-        votes = payload["votes"]
-        avg = payload["weighted_sum"] / votes if votes else float("nan")
-        yearly_rating_records.append({"year": year, "weighted_average_rating": avg, "votes": votes})
     yearly_ratings_df = (
-        pd.DataFrame(yearly_rating_records)
+        pd.DataFrame(
+            {
+                "year": years,
+                "weighted_average_rating": (
+                    pd.Series(totals.year_weighted_sums) / pd.Series(totals.year_votes)
+                ),
+                "votes": totals.year_votes.astype(np.int64),
+            }
+        )
         .dropna(subset=["weighted_average_rating"])
         .sort_values("year")
         .reset_index(drop=True)
     )
 
-    runtime_series = pd.Series(runtime_minutes)
+    # Runtimes are whole minutes, so a per-minute count array describes the
+    # distribution exactly without holding one value per film.
+    runtime_counts = totals.runtime_counts
+    runtime_values = np.flatnonzero(runtime_counts)
+    runtime_total = int(runtime_counts.sum())
     runtime_bins_df = pd.DataFrame()
-    if not runtime_series.empty:
-        max_runtime = float(runtime_series.max())
+    if runtime_total:
+        max_runtime = float(runtime_values[-1])
         runtime_edges = [0, 60, 75, 90, 105, 120, 150, 180]
         if max_runtime > runtime_edges[-1]:
             runtime_edges.append(max_runtime + 1)
@@ -184,49 +655,44 @@ def analyse() -> None:
             "180+",
         ][: len(runtime_edges) - 1]
         runtime_bins = pd.cut(
-            runtime_series.dropna(),
+            runtime_values,
             bins=runtime_edges,
             labels=runtime_labels,
             right=False,
         )
         runtime_bins_df = (
-            runtime_bins.value_counts(sort=False)
+            pd.Series(runtime_counts[runtime_values])
+            .groupby(runtime_bins, observed=False)
+            .sum()
             .rename_axis("runtime_bin")
             .reset_index(name="count")
         )
 
-    runtime_quantiles = runtime_series.quantile([0.1, 0.25, 0.5, 0.75, 0.9])
-    long_runtime_share = float((runtime_series >= 120).sum() / len(runtime_series)) if len(runtime_series) else float('nan')
-    genre_records = []
-    for genre, payload in genre_stats.items():
-        votes = payload["votes"]
-        avg_rating = payload["weighted_sum"] / votes if votes else float("nan")
-        genre_records.append(
+    runtime_quantiles = quantiles_from_counts(runtime_counts, [0.1, 0.25, 0.5, 0.75, 0.9])
+    long_runtime_share = float(runtime_counts[120:].sum() / runtime_total) if runtime_total else float('nan')
+    genre_df = (
+        pd.DataFrame(
             {
-                "genre": genre,
-                "title_count": payload["count"],
-                "total_votes": votes,
-                "weighted_average_rating": avg_rating,
+                "genre": GENRE_NAMES,
+                "title_count": totals.genre_counts,
+                "total_votes": totals.genre_votes.astype(np.int64),
+                "weighted_average_rating": (
+                    pd.Series(totals.genre_weighted_sums) / pd.Series(totals.genre_votes)
+                ),
             }
         )
-    genre_df = (
-        pd.DataFrame(genre_records)
         .dropna(subset=["weighted_average_rating"])
         .sort_values("total_votes", ascending=False)
         .reset_index(drop=True)
     )
 
-    top_titles_df = (
-        pd.concat(top_titles_frames, ignore_index=True)
-        .dropna(subset=["numVotes"])
-        .sort_values("numVotes", ascending=False)
-        .drop_duplicates("tconst")
-        .head(20)
-    )
+    top_titles_df = pd.DataFrame(
+        [row for _, _, row in totals.top_titles], columns=TOP_TITLE_COLUMNS
+    ).astype({"startYear": "Int64"})
 
     scatter_df = (
-        pd.concat(scatter_frames, ignore_index=True)
-        if scatter_frames
+        totals.scatter_sample.drop(columns="sample_key").reset_index(drop=True)
+        if totals.scatter_sample is not None
         else pd.DataFrame(columns=["averageRating", "numVotes"])
     )
 
@@ -272,10 +738,8 @@ def analyse() -> None:
 
     print("🧮 Calculating summary statistics...")
     total_rated_movies = int(movies_per_year_df["count"].sum())
-    median_runtime = float(runtime_series.median())
-    overall_weighted_rating = weighted_average(
-        ratings_df["averageRating"], ratings_df["numVotes"].astype(float)
-    )
+    median_runtime = float(runtime_quantiles.loc[0.5])
+    overall_weighted_rating = weighted_average(rating_lookup, votes_lookup)
 
     summaries = {
         "total_rated_movies": total_rated_movies,
@@ -329,7 +793,9 @@ def analyse() -> None:
     plt.close()
 
     plt.figure(figsize=(10, 6))
-    sns.histplot(runtime_series.dropna(), bins=60, color="#3182bd")
+    sns.histplot(
+        x=runtime_values, weights=runtime_counts[runtime_values], bins=60, color="#3182bd"
+    )
     plt.title("Distribution of Feature Film Runtime Minutes")
     plt.xlabel("Runtime (minutes)")
     plt.ylabel("Number of Movies")
@@ -339,14 +805,16 @@ def analyse() -> None:
 
     if not scatter_df.empty:
         plt.figure(figsize=(10, 6))
-        sns.scatterplot(
-            data=scatter_df,
-            x="numVotes",
-            y="averageRating",
-            alpha=0.4,
-            edgecolor=None,
+        plt.hexbin(
+            scatter_df["numVotes"].to_numpy(dtype=np.float64),
+            scatter_df["averageRating"].to_numpy(dtype=np.float64),
+            gridsize=60,
+            xscale="log",
+            bins="log",
+            cmap="viridis",
+            mincnt=1,
         )
-        plt.xscale("log")
+        plt.colorbar(label="Number of Movies (log scale)")
         plt.ylim(4, 10)
         plt.title("How IMDb Popularity Relates to Audience Ratings")
         plt.xlabel("Number of Votes (log scale)")